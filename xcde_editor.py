@@ -1,9 +1,20 @@
 #!/usr/bin/env python3
-import struct
+import argparse
+import json
+import mmap
+import operator
 import os
+import shutil
+import struct
 import sys
 from enum import IntEnum
 
+# Little-endian u32, the format of the party member stats
+_U32 = struct.Struct("<I")
+
+# Little-endian unsigned formats by field size in bytes, used by apply_writes
+_FIELD_STRUCTS = {1: struct.Struct("<B"), 2: struct.Struct("<H"), 4: _U32}
+
 class Character(IntEnum):
     """Character IDs for Xenoblade Chronicles: Definitive Edition"""
     NONE = 0
@@ -42,17 +53,19 @@ class ArtsLevelUnlocked(IntEnum):
     X_EXPERT = 2         # Up to level 10
     XII_MASTER = 3       # Up to level 12
 
-# Character positions in PartyMembers array
-CHARACTER_POSITIONS = {
-    Character.SHULK: 0,
-    Character.REYN: 1,
-    Character.FIORA: 2,
-    Character.DUNBAN: 3,
-    Character.SHARLA: 4,
-    Character.RIKI: 5,
-    Character.MELIA: 6,
-    Character.FIORA_2: 7,
-}
+# Cache of Character enum members by ID, filled on first lookup
+_CHARACTER_CACHE = {}
+
+def _character(character_id):
+    """Get the Character for an ID without re-running the IntEnum lookup"""
+    char = _CHARACTER_CACHE.get(character_id)
+    if char is None:
+        char = _CHARACTER_CACHE[character_id] = Character(character_id)
+    return char
+
+# Range of valid character IDs, checked before falling back to Character for the error
+_FIRST_CHARACTER_ID = min(Character)
+_LAST_CHARACTER_ID = max(Character)
 
 class XCDESaveEditor:
     # Important offsets in the save file
@@ -61,97 +74,135 @@ class XCDESaveEditor:
     EXP_OFFSET_IN_MEMBER = 0x04
     LEVEL_OFFSET_IN_MEMBER = 0x00
     AP_OFFSET_IN_MEMBER = 0x08
+    MAIN_CHARACTER_COUNT = 15
     
     # Arts levels offset and size
     ARTS_LEVELS_OFFSET = 0x1536E8
     ARTS_LEVEL_SIZE = 2
     TOTAL_ARTS = 188
     
+    # Level, XP and AP are the first three fields of each party member
+    _MEMBER_HEADER = struct.Struct("<III")
+    _MEMBER_RECORD = struct.Struct("<III%dx" % (PARTY_MEMBER_SIZE - _MEMBER_HEADER.size))
+    
     def __init__(self, save_path):
         """Initialize the editor with the path to the save file"""
         self.save_path = save_path
         self.backup_path = save_path + ".backup"
         
-        # Read the save file
-        with open(save_path, 'rb') as f:
-            self.save_data = bytearray(f.read())
+        # Precompute absolute offsets so art getters and setters are a single lookup
+        self._art_offsets = [self.ARTS_LEVELS_OFFSET + i * self.ARTS_LEVEL_SIZE for i in range(self.TOTAL_ARTS)]
         
-        # Create a backup
+        # Create a backup, straight from the file before it is loaded
         self._create_backup()
+        
+        # Map the save file
+        self._load()
+        # Set by every setter so unchanged saves are not rewritten
+        self._dirty = False
+    
+    def _load(self, path=None, mapped=True):
+        """Map the save file into memory, or read it if it can't be mapped"""
+        with open(path or self.save_path, 'rb') as f:
+            self.save_data = None
+            if mapped:
+                try:
+                    # Copy-on-write mapping: edits stay private until save() writes them
+                    # out, so the original file is never modified behind the user's back
+                    self.save_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+                except (OSError, ValueError):
+                    # Some files can't be mapped (empty files, some network filesystems)
+                    pass
+            if self.save_data is None:
+                # Read straight into a buffer allocated at the file's size instead
+                self.save_data = bytearray(os.fstat(f.fileno()).st_size)
+                size = f.readinto(self.save_data)
+                del self.save_data[size:]
+        # Zero-copy view used for all field reads and writes
+        self._mv = memoryview(self.save_data)
+    
+    def close(self):
+        """Release the mapping of the save file"""
+        self._mv.release()
+        if isinstance(self.save_data, mmap.mmap):
+            self.save_data.close()
     
     def _create_backup(self):
-        """Create a backup of the original save file"""
-        if not os.path.exists(self.backup_path):
-            with open(self.backup_path, 'wb') as f:
-                f.write(self.save_data)
-            print(f"Backup created at {self.backup_path}")
+        """Create a backup of the original save file with a kernel-side file copy"""
+        # Claim the backup path with an exclusive create instead of checking that it
+        # exists first, so an existing backup is never overwritten
+        try:
+            open(self.backup_path, 'xb').close()
+        except FileExistsError:
+            return
+        try:
+            shutil.copyfile(self.save_path, self.backup_path)
+        except BaseException:
+            # Don't leave an empty backup behind that would block the next attempt
+            os.remove(self.backup_path)
+            raise
+        print(f"Backup created at {self.backup_path}")
     
     def get_character_position(self, character_id):
         """Get the position of a character in the PartyMembers array"""
-        char_enum = Character(character_id)
-        return CHARACTER_POSITIONS.get(char_enum, character_id - 1)
-    
-    def get_character_exp(self, character_id):
-        """Get the current XP for a specific character"""
-        position = self.get_character_position(character_id)
-        offset = self.PARTY_MEMBERS_OFFSET + (position * self.PARTY_MEMBER_SIZE) + self.EXP_OFFSET_IN_MEMBER
-        return struct.unpack("<I", self.save_data[offset:offset+4])[0]
-    
-    def get_character_level(self, character_id):
-        """Get the current level for a specific character"""
-        position = self.get_character_position(character_id)
-        offset = self.PARTY_MEMBERS_OFFSET + (position * self.PARTY_MEMBER_SIZE) + self.LEVEL_OFFSET_IN_MEMBER
-        return struct.unpack("<I", self.save_data[offset:offset+4])[0]
-    
-    def get_character_ap(self, character_id):
-        """Get the current AP for a specific character"""
-        position = self.get_character_position(character_id)
-        offset = self.PARTY_MEMBERS_OFFSET + (position * self.PARTY_MEMBER_SIZE) + self.AP_OFFSET_IN_MEMBER
-        return struct.unpack("<I", self.save_data[offset:offset+4])[0]
-    
-    def set_character_exp(self, character_id, new_exp):
-        """Set a new XP value for a specific character"""
-        position = self.get_character_position(character_id)
-        offset = self.PARTY_MEMBERS_OFFSET + (position * self.PARTY_MEMBER_SIZE) + self.EXP_OFFSET_IN_MEMBER
-        self.save_data[offset:offset+4] = struct.pack("<I", new_exp)
-    
-    def set_character_level(self, character_id, new_level):
-        """Set a new level for a specific character"""
-        position = self.get_character_position(character_id)
-        offset = self.PARTY_MEMBERS_OFFSET + (position * self.PARTY_MEMBER_SIZE) + self.LEVEL_OFFSET_IN_MEMBER
-        self.save_data[offset:offset+4] = struct.pack("<I", new_level)
+        # Characters are stored in ID order, starting with SHULK at position 0
+        return character_id - 1
+    
+    def _member_offset(self, character_id):
+        """Get the offset of a character's record in the PartyMembers array"""
+        character_id = operator.index(character_id)
+        if not _FIRST_CHARACTER_ID <= character_id <= _LAST_CHARACTER_ID:
+            # Let Character raise the usual error for unknown IDs
+            _character(character_id)
+        return self.PARTY_MEMBERS_OFFSET + self.get_character_position(character_id) * self.PARTY_MEMBER_SIZE
+    
+    # get_character_exp/level/ap and set_character_exp/level/ap are generated
+    # after the class by _make_member_accessors
+    
+    def get_main_character_stats(self):
+        """Get (level, exp, ap) for each main character (1-15), read in one pass"""
+        start = self.PARTY_MEMBERS_OFFSET
+        end = start + self.MAIN_CHARACTER_COUNT * self.PARTY_MEMBER_SIZE
+        return list(self._MEMBER_RECORD.iter_unpack(self._mv[start:end]))
     
     def set_all_character_levels(self, new_level):
         """Set the same level for all characters"""
-        # Set for main characters (1-15)
-        for char_id in range(1, 16):
-            try:
-                self.set_character_level(char_id, new_level)
-            except Exception as e:
-                print(f"Warning: Could not set level for character {char_id}: {e}")
+        # Set for main characters (1-15). Their records are evenly spaced, so each
+        # byte of the level is written to the whole party with one strided store.
+        count = self.MAIN_CHARACTER_COUNT
+        start = self.PARTY_MEMBERS_OFFSET + self.LEVEL_OFFSET_IN_MEMBER
+        end = start + count * self.PARTY_MEMBER_SIZE
+        for i, byte in enumerate(_U32.pack(new_level)):
+            self._mv[start+i:end:self.PARTY_MEMBER_SIZE] = bytes([byte]) * count
+        self._dirty = True
         return True
     
-    def set_character_ap(self, character_id, new_ap):
-        """Set a new AP value for a specific character"""
-        position = self.get_character_position(character_id)
-        offset = self.PARTY_MEMBERS_OFFSET + (position * self.PARTY_MEMBER_SIZE) + self.AP_OFFSET_IN_MEMBER
-        self.save_data[offset:offset+4] = struct.pack("<I", new_ap)
+    def set_character_stats(self, character_id, new_level, new_exp, new_ap):
+        """Set level, XP and AP for a specific character in a single store"""
+        offset = self._member_offset(character_id) + self.LEVEL_OFFSET_IN_MEMBER
+        # Pack before storing so an out-of-range value raises without touching the save
+        data = self._MEMBER_HEADER.pack(new_level, new_exp, new_ap)
+        self._mv[offset:offset+self._MEMBER_HEADER.size] = data
+        self._dirty = True
     
     def get_art_level(self, art_index):
         """Get the current level of an art"""
         if art_index < 0 or art_index >= self.TOTAL_ARTS:
             raise ValueError(f"Art index must be between 0 and {self.TOTAL_ARTS-1}")
         
-        offset = self.ARTS_LEVELS_OFFSET + (art_index * self.ARTS_LEVEL_SIZE)
-        return self.save_data[offset]
+        offset = self._art_offsets[art_index]
+        return self._mv[offset]
     
     def get_art_max_unlock(self, art_index):
         """Get the max unlock level of an art"""
+        return ArtsLevelUnlocked(self.get_art_max_unlock_raw(art_index))
+    
+    def get_art_max_unlock_raw(self, art_index):
+        """Get the max unlock level of an art as a plain int, without the enum lookup"""
         if art_index < 0 or art_index >= self.TOTAL_ARTS:
             raise ValueError(f"Art index must be between 0 and {self.TOTAL_ARTS-1}")
         
-        offset = self.ARTS_LEVELS_OFFSET + (art_index * self.ARTS_LEVEL_SIZE) + 1
-        return ArtsLevelUnlocked(self.save_data[offset])
+        return self._mv[self._art_offsets[art_index] + 1]
     
     def set_art_level(self, art_index, new_level):
         """Set a new level for an art"""
@@ -160,244 +211,342 @@ class XCDESaveEditor:
         if new_level < 0 or new_level > 12:
             raise ValueError("Art level must be between 0 and 12")
         
-        offset = self.ARTS_LEVELS_OFFSET + (art_index * self.ARTS_LEVEL_SIZE)
-        self.save_data[offset] = new_level
+        offset = self._art_offsets[art_index]
+        self._mv[offset] = new_level
+        self._dirty = True
     
     def set_art_max_unlock(self, art_index, new_max_unlock):
         """Set a new max unlock level for an art"""
         if art_index < 0 or art_index >= self.TOTAL_ARTS:
             raise ValueError(f"Art index must be between 0 and {self.TOTAL_ARTS-1}")
-        if isinstance(new_max_unlock, int):
-            if new_max_unlock < 0 or new_max_unlock > 3:
-                raise ValueError("Max unlock level must be between 0 and 3")
-            unlock_value = new_max_unlock
-        else:
-            unlock_value = int(ArtsLevelUnlocked(new_max_unlock))
+        # Accepts ints and ArtsLevelUnlocked members without an enum lookup,
+        # while floats and strings are still rejected
+        unlock_value = operator.index(new_max_unlock)
+        if unlock_value < 0 or unlock_value > 3:
+            raise ValueError("Max unlock level must be between 0 and 3")
         
-        offset = self.ARTS_LEVELS_OFFSET + (art_index * self.ARTS_LEVEL_SIZE) + 1
-        self.save_data[offset] = unlock_value
+        offset = self._art_offsets[art_index] + 1
+        self._mv[offset] = unlock_value
+        self._dirty = True
     
     def set_all_arts_levels(self, new_level):
         """Set all arts to the same level"""
         if new_level < 0 or new_level > 12:
             raise ValueError("Art level must be between 0 and 12")
         
-        for i in range(self.TOTAL_ARTS):
-            self.set_art_level(i, new_level)
+        # Levels are every other byte of the arts block, so store them all at once
+        start = self.ARTS_LEVELS_OFFSET
+        end = start + self.TOTAL_ARTS * self.ARTS_LEVEL_SIZE
+        self._mv[start:end:self.ARTS_LEVEL_SIZE] = bytes([new_level]) * self.TOTAL_ARTS
+        self._dirty = True
         return True
     
     def set_all_arts_max_unlock(self, new_max_unlock):
         """Set all arts to the same max unlock level"""
-        if isinstance(new_max_unlock, int):
-            if new_max_unlock < 0 or new_max_unlock > 3:
-                raise ValueError("Max unlock level must be between 0 and 3")
-            unlock_value = new_max_unlock
-        else:
-            unlock_value = int(ArtsLevelUnlocked(new_max_unlock))
+        # Accepts ints and ArtsLevelUnlocked members without an enum lookup,
+        # while floats and strings are still rejected
+        unlock_value = operator.index(new_max_unlock)
+        if unlock_value < 0 or unlock_value > 3:
+            raise ValueError("Max unlock level must be between 0 and 3")
         
-        for i in range(self.TOTAL_ARTS):
-            self.set_art_max_unlock(i, unlock_value)
+        # Max unlocks are the odd bytes of the arts block, so store them all at once
+        start = self.ARTS_LEVELS_OFFSET + 1
+        end = self.ARTS_LEVELS_OFFSET + self.TOTAL_ARTS * self.ARTS_LEVEL_SIZE
+        self._mv[start:end:self.ARTS_LEVEL_SIZE] = bytes([unlock_value]) * self.TOTAL_ARTS
+        self._dirty = True
         return True
     
-    def save(self, output_path=None):
-        """Save the modified save file"""
+    def apply_writes(self, writes):
+        """Apply a batch of raw (offset, size, value) writes to the save data
+        
+        Sizes are 1, 2 or 4 bytes and values are stored little-endian. Every write
+        is validated before any is applied, so a bad entry leaves the save unchanged.
+        """
+        staged = []
+        save_size = len(self.save_data)
+        for offset, size, value in writes:
+            # Normalise here so a bad type fails before anything is stored
+            offset = operator.index(offset)
+            size = operator.index(size)
+            packer = _FIELD_STRUCTS.get(size)
+            if packer is None:
+                raise ValueError(f"Write size must be 1, 2 or 4 bytes, not {size}")
+            if offset < 0 or offset + size > save_size:
+                raise ValueError(f"Write at offset {offset:#x} is outside the save file")
+            staged.append((offset, offset + size, packer.pack(value)))
+        
+        mv = self._mv
+        for start, end, data in staged:
+            mv[start:end] = data
+        if staged:
+            self._dirty = True
+        return True
+    
+    def save(self, output_path=None, sync=True):
+        """Save the modified save file
+        
+        Pass sync=False to skip the fsync when the file will be saved again
+        shortly, leaving the write to the OS page cache.
+        """
         if output_path is None:
             output_path = self.save_path
         
-        with open(output_path, 'wb') as f:
-            f.write(self.save_data)
+        # Nothing to do when unchanged data would be written back over the original
+        in_place = os.path.abspath(output_path) == os.path.abspath(self.save_path)
+        if in_place and not self._dirty:
+            print(f"No changes to write to {output_path}")
+            return
+        
+        # Write to a temporary file and rename it over the target, so an
+        # interrupted save never leaves a truncated file behind
+        tmp_path = output_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb', buffering=1024*1024) as f:
+                f.write(self.save_data)
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            if not in_place:
+                os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        if in_place:
+            # The mapping holds the original file open, which prevents replacing
+            # it on Windows, so release it and map the newly written file instead
+            self.close()
+            try:
+                os.replace(tmp_path, output_path)
+            except BaseException:
+                # The original is unchanged, so keep the edits by reading them back
+                # from the temporary file (not mapped, since it is removed next)
+                self._load(tmp_path, mapped=False)
+                os.remove(tmp_path)
+                raise
+            self._load()
+            self._dirty = False
         print(f"Save file written to {output_path}")
 
     def get_character_name(self, character_id):
         """Get the name of a character from its ID"""
         try:
-            return Character(character_id).name
+            return _character(character_id).name
         except ValueError:
             return f"Unknown Character ({character_id})"
 
-# Example usage
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage:")
-        print("  1. View character stats: python test.py <save_file>")
-        print("  2. Modify character XP: python test.py <save_file> <character_id> <new_xp>")
-        print("  3. Modify character level: python test.py <save_file> level <character_id> <new_level>")
-        print("  4. Modify character AP: python test.py <save_file> ap <character_id> <new_ap>")
-        print("  5. Modify ALL characters level: python test.py <save_file> alllevel <new_level>")
-        print("  6. Set level for ALL arts: python test.py <save_file> allartlevel <new_level>")
-        print("  7. Set max unlock level for ALL arts: python test.py <save_file> allartmax <new_max_level>")
-        print("\nCharacter IDs:")
-        for char in Character:
-            if char != Character.NONE:
-                print(f"  {int(char)}: {char.name}")
-        sys.exit(1)
+# Template for the party member stat accessors. The offsets are filled in as
+# integer literals so each call is one multiply-add on constants.
+_MEMBER_ACCESSORS_TEMPLATE = '''
+def get_character_{field}(self, character_id):
+    """Get the current {name} for a specific character"""
+    character_id = operator.index(character_id)
+    if not {first} <= character_id <= {last}:
+        _character(character_id)
+    return _U32.unpack_from(self._mv, {base} + character_id * {size})[0]
+
+def set_character_{field}(self, character_id, new_{field}):
+    """Set a new {value_name} for a specific character"""
+    character_id = operator.index(character_id)
+    if not {first} <= character_id <= {last}:
+        _character(character_id)
+    # Pack before storing so an out-of-range value raises without touching the save
+    offset = {base} + character_id * {size}
+    self._mv[offset:offset+4] = _U32.pack(new_{field})
+    self._dirty = True
+'''
+
+def _make_member_accessors(cls):
+    """Generate the stat getters and setters on cls with their offsets baked in"""
+    fields = (
+        ("exp", "XP", "XP value", cls.EXP_OFFSET_IN_MEMBER),
+        ("level", "level", "level", cls.LEVEL_OFFSET_IN_MEMBER),
+        ("ap", "AP", "AP value", cls.AP_OFFSET_IN_MEMBER),
+    )
+    for field, name, value_name, field_offset in fields:
+        # Positions are character_id - 1, so the first record's offset is folded into base
+        source = _MEMBER_ACCESSORS_TEMPLATE.format(
+            field=field,
+            name=name,
+            value_name=value_name,
+            first=int(_FIRST_CHARACTER_ID),
+            last=int(_LAST_CHARACTER_ID),
+            base=cls.PARTY_MEMBERS_OFFSET - cls.PARTY_MEMBER_SIZE + field_offset,
+            size=cls.PARTY_MEMBER_SIZE,
+        )
+        namespace = {}
+        exec(compile(source, f"<{cls.__name__} {field} accessors>", "exec"), globals(), namespace)
+        for func_name, func in namespace.items():
+            func.__qualname__ = f"{cls.__name__}.{func_name}"
+            setattr(cls, func_name, func)
+
+_make_member_accessors(XCDESaveEditor)
 
-    save_file = sys.argv[1]
+def _cmd_stats(editor, args):
+    """Display character stats"""
+    print("Character Stats:")
+    print("-" * 50)
+    # Main characters are usually 1-15
+    for char_id, (level, exp, ap) in enumerate(editor.get_main_character_stats(), 1):
+        print(f"{char_id}: {editor.get_character_name(char_id)}")
+        print(f"  Level: {level}")
+        print(f"  XP: {exp}")
+        print(f"  AP: {ap}")
+        print("-" * 50)
+
+def _cmd_xp(editor, args):
+    """Modify a character's XP"""
+    char_name = editor.get_character_name(args.character_id)
+    old_xp = editor.get_character_exp(args.character_id)
+    old_level = editor.get_character_level(args.character_id)
     
-    if not os.path.exists(save_file):
-        print(f"Error: Save file '{save_file}' not found.")
-        sys.exit(1)
+    editor.set_character_exp(args.character_id, args.new_xp)
     
-    editor = XCDESaveEditor(save_file)
+    print(f"Modified {char_name}'s XP from {old_xp} to {args.new_xp}")
+    print(f"Current level: {old_level}")
+    print("Note: You may need to adjust the level separately if you want it to match the new XP value.")
+
+def _cmd_level(editor, args):
+    """Modify a character's level"""
+    char_name = editor.get_character_name(args.character_id)
+    old_level = editor.get_character_level(args.character_id)
     
-    if len(sys.argv) == 2:
-        # Just display character stats
-        print("Character Stats:")
-        print("-" * 50)
-        for char_id in range(1, 16):  # Main characters are usually 1-15
-            try:
-                char_name = editor.get_character_name(char_id)
-                level = editor.get_character_level(char_id)
-                exp = editor.get_character_exp(char_id)
-                ap = editor.get_character_ap(char_id)
-                
-                print(f"{char_id}: {char_name}")
-                print(f"  Level: {level}")
-                print(f"  XP: {exp}")
-                print(f"  AP: {ap}")
-                print("-" * 50)
-            except Exception as e:
-                pass  # Skip characters that might cause errors
-    
-    elif len(sys.argv) == 4 and sys.argv[2] == "alllevel":
-        # Modify all characters' levels
-        try:
-            new_level = int(sys.argv[3])
-        except ValueError:
-            print("Error: Level must be a number.")
-            sys.exit(1)
-        
-        try:
-            editor.set_all_character_levels(new_level)
-            
-            # Save with a new filename to be safe
-            modified_save = save_file + ".modified"
-            editor.save(modified_save)
-            
-            print(f"Set all characters to level {new_level}")
-            print(f"Modified save written to: {modified_save}")
-        except Exception as e:
-            print(f"Error modifying levels: {e}")
-            sys.exit(1)
+    editor.set_character_level(args.character_id, args.new_level)
     
-    elif len(sys.argv) == 4 and sys.argv[2] == "allartlevel":
-        # Set level for all arts
-        try:
-            new_level = int(sys.argv[3])
-        except ValueError:
-            print("Error: Level must be a number.")
-            sys.exit(1)
-        
-        try:
-            editor.set_all_arts_levels(new_level)
-            
-            # Save with a new filename to be safe
-            modified_save = save_file + ".modified"
-            editor.save(modified_save)
-            
-            print(f"Set all arts to level {new_level}")
-            print(f"Modified save written to: {modified_save}")
-        except Exception as e:
-            print(f"Error modifying arts: {e}")
-            sys.exit(1)
+    print(f"Modified {char_name}'s level from {old_level} to {args.new_level}")
+
+def _cmd_ap(editor, args):
+    """Modify a character's AP"""
+    char_name = editor.get_character_name(args.character_id)
+    old_ap = editor.get_character_ap(args.character_id)
     
-    elif len(sys.argv) == 4 and sys.argv[2] == "allartmax":
-        # Set max unlock level for all arts
-        try:
-            new_max = int(sys.argv[3])
-        except ValueError:
-            print("Error: Max level must be a number.")
-            sys.exit(1)
-        
-        try:
-            editor.set_all_arts_max_unlock(new_max)
-            
-            # Save with a new filename to be safe
-            modified_save = save_file + ".modified"
-            editor.save(modified_save)
-            
-            print(f"Set all arts to max unlock level {new_max}")
-            print(f"Modified save written to: {modified_save}")
-        except Exception as e:
-            print(f"Error modifying arts: {e}")
-            sys.exit(1)
+    editor.set_character_ap(args.character_id, args.new_ap)
     
-    elif len(sys.argv) == 4:
-        # Modify a character's XP
-        try:
-            char_id = int(sys.argv[2])
-            new_xp = int(sys.argv[3])
-        except ValueError:
-            print("Error: Character ID and XP must be numbers.")
-            sys.exit(1)
-        
-        try:
-            char_name = editor.get_character_name(char_id)
-            old_xp = editor.get_character_exp(char_id)
-            old_level = editor.get_character_level(char_id)
-            
-            editor.set_character_exp(char_id, new_xp)
-            
-            # Save with a new filename to be safe
-            modified_save = save_file + ".modified"
-            editor.save(modified_save)
-            
-            print(f"Modified {char_name}'s XP from {old_xp} to {new_xp}")
-            print(f"Current level: {old_level}")
-            print(f"Modified save written to: {modified_save}")
-            print("Note: You may need to adjust the level separately if you want it to match the new XP value.")
-        except Exception as e:
-            print(f"Error modifying character: {e}")
-            sys.exit(1)
+    print(f"Modified {char_name}'s AP from {old_ap} to {args.new_ap}")
+
+def _cmd_alllevel(editor, args):
+    """Modify all characters' levels"""
+    editor.set_all_character_levels(args.new_level)
+    print(f"Set all characters to level {args.new_level}")
+
+def _cmd_allartlevel(editor, args):
+    """Set level for all arts"""
+    editor.set_all_arts_levels(args.new_level)
+    print(f"Set all arts to level {args.new_level}")
+
+def _cmd_allartmax(editor, args):
+    """Set max unlock level for all arts"""
+    editor.set_all_arts_max_unlock(args.new_max_level)
+    print(f"Set all arts to max unlock level {args.new_max_level}")
+
+def _build_parser():
+    """Build the command line parser"""
+    character_ids = "\n".join(f"  {int(char)}: {char.name}" for char in Character if char != Character.NONE)
+    parser = argparse.ArgumentParser(
+        description="Xenoblade Chronicles: Definitive Edition save editor. "
+                    "Modified saves are written to <save_file>.modified.",
+        epilog=f"Character IDs:\n{character_ids}",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("save_file", help="path to the save file")
+    parser.add_argument("--batch", metavar="FILE",
+                        help='JSON list of commands applied in order before a single save, '
+                             'e.g. [["alllevel", 99], ["allartmax", 3]]')
+    parser.set_defaults(func=_cmd_stats, modifies=False)
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
     
-    elif len(sys.argv) == 5 and sys.argv[2] == "level":
-        # Modify a character's level
-        try:
-            char_id = int(sys.argv[3])
-            new_level = int(sys.argv[4])
-        except ValueError:
-            print("Error: Character ID and level must be numbers.")
-            sys.exit(1)
-        
-        try:
-            char_name = editor.get_character_name(char_id)
-            old_level = editor.get_character_level(char_id)
-            
-            editor.set_character_level(char_id, new_level)
-            
-            # Save with a new filename to be safe
-            modified_save = save_file + ".modified"
-            editor.save(modified_save)
-            
-            print(f"Modified {char_name}'s level from {old_level} to {new_level}")
-            print(f"Modified save written to: {modified_save}")
-        except Exception as e:
-            print(f"Error modifying character: {e}")
-            sys.exit(1)
+    sub = subparsers.add_parser("stats", help="view character stats (default)")
+    sub.set_defaults(func=_cmd_stats, modifies=False)
+    
+    sub = subparsers.add_parser("xp", help="modify a character's XP")
+    sub.add_argument("character_id", type=int)
+    sub.add_argument("new_xp", type=int)
+    sub.set_defaults(func=_cmd_xp, modifies=True, target="character")
+    
+    sub = subparsers.add_parser("level", help="modify a character's level")
+    sub.add_argument("character_id", type=int)
+    sub.add_argument("new_level", type=int)
+    sub.set_defaults(func=_cmd_level, modifies=True, target="character")
+    
+    sub = subparsers.add_parser("ap", help="modify a character's AP")
+    sub.add_argument("character_id", type=int)
+    sub.add_argument("new_ap", type=int)
+    sub.set_defaults(func=_cmd_ap, modifies=True, target="character")
+    
+    sub = subparsers.add_parser("alllevel", help="modify ALL characters' level")
+    sub.add_argument("new_level", type=int)
+    sub.set_defaults(func=_cmd_alllevel, modifies=True, target="levels")
+    
+    sub = subparsers.add_parser("allartlevel", help="set level for ALL arts")
+    sub.add_argument("new_level", type=int)
+    sub.set_defaults(func=_cmd_allartlevel, modifies=True, target="arts")
+    
+    sub = subparsers.add_parser("allartmax", help="set max unlock level for ALL arts (0-3)")
+    sub.add_argument("new_max_level", type=int)
+    sub.set_defaults(func=_cmd_allartmax, modifies=True, target="arts")
+    
+    return parser
+
+def main(argv=None):
+    """Run the command line interface"""
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    parser = _build_parser()
+    if not argv:
+        parser.print_help()
+        sys.exit(1)
+    
+    # Keep supporting the original "<save_file> <character_id> <new_xp>" form
+    if len(argv) == 3 and argv[1].isdigit():
+        argv = [argv[0], "xp"] + argv[1:]
     
-    elif len(sys.argv) == 5 and sys.argv[2] == "ap":
-        # Modify a character's AP
+    args = parser.parse_args(argv)
+    if args.batch is not None and args.command is not None:
+        parser.error("--batch cannot be combined with a command")
+    
+    if not os.path.exists(args.save_file):
+        print(f"Error: Save file '{args.save_file}' not found.")
+        sys.exit(1)
+    
+    # Parse every batch command up front so a bad entry is reported before any edit
+    if args.batch is not None:
         try:
-            char_id = int(sys.argv[3])
-            new_ap = int(sys.argv[4])
-        except ValueError:
-            print("Error: Character ID and AP must be numbers.")
-            sys.exit(1)
-        
+            with open(args.batch) as f:
+                ops = json.load(f)
+        except (OSError, ValueError) as e:
+            parser.error(f"could not read batch file '{args.batch}': {e}")
+        if not isinstance(ops, list):
+            parser.error("batch file must contain a list of commands")
+        commands = []
+        for op in ops:
+            # Options such as -h or --batch would be handled by the real parser
+            # (printing help and exiting), so only plain arguments are allowed
+            if (not isinstance(op, list) or not op
+                    or any(isinstance(a, str) and a.startswith("-") for a in op)):
+                parser.error(f"invalid batch command: {op!r}")
+            commands.append(parser.parse_args([args.save_file] + [str(a) for a in op]))
+    else:
+        commands = [args]
+    
+    # The save is loaded once, all commands are applied in memory and it is written once
+    editor = XCDESaveEditor(args.save_file)
+    for command in commands:
+        if not command.modifies:
+            command.func(editor, command)
+            continue
         try:
-            char_name = editor.get_character_name(char_id)
-            old_ap = editor.get_character_ap(char_id)
-            
-            editor.set_character_ap(char_id, new_ap)
-            
-            # Save with a new filename to be safe
-            modified_save = save_file + ".modified"
-            editor.save(modified_save)
-            
-            print(f"Modified {char_name}'s AP from {old_ap} to {new_ap}")
-            print(f"Modified save written to: {modified_save}")
+            command.func(editor, command)
         except Exception as e:
-            print(f"Error modifying character: {e}")
+            print(f"Error modifying {command.target}: {e}")
             sys.exit(1)
-    else:
-        print("Invalid arguments. Use the script without arguments to see usage instructions.")
\ No newline at end of file
+    
+    if any(command.modifies for command in commands):
+        # Save with a new filename to be safe
+        modified_save = args.save_file + ".modified"
+        editor.save(modified_save)
+        print(f"Modified save written to: {modified_save}")
+
+if __name__ == "__main__":
+    main()